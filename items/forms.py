@@ -16,7 +16,7 @@ class ItemForm(forms.ModelForm):
 
     class Meta:
         model = Item
-        fields = ['note', 'type', 'action_length', 'time_frame', 'value', 'difficulty', 'life_category']
+        fields = ['note', 'type', 'action_length', 'time_frame', 'value', 'difficulty', 'life_category', 'parent']
         widgets = {
             'note': forms.Textarea(attrs={
                 'rows': 4,
@@ -30,6 +30,7 @@ class ItemForm(forms.ModelForm):
             'value': forms.Select(attrs={'class': 'win95-select'}),
             'difficulty': forms.Select(attrs={'class': 'win95-select'}),
             'life_category': forms.Select(attrs={'class': 'win95-select'}),
+            'parent': forms.Select(attrs={'class': 'win95-select'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -37,6 +38,11 @@ class ItemForm(forms.ModelForm):
         # Add empty option for life_category
         self.fields['life_category'].empty_label = '—'
         self.fields['life_category'].required = False
+        # Only Journeys and Projects can hold other items
+        self.fields['parent'].queryset = Item.objects.filter(
+            type__in=Item.PARENT_TYPES
+        ).exclude(status='Remove').order_by('note')
+        self.fields['parent'].empty_label = '—'
 
     def save(self, commit=True):
         instance = super().save(commit=False)
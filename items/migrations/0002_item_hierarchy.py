@@ -0,0 +1,44 @@
+# Generated by Django 4.2.9 on 2026-10-19 09:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='children', to='items.item'),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='rollup_complete',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='rollup_minutes',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='rollup_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='item',
+            name='time_frame',
+            field=models.CharField(blank=True, choices=[('', '—'), ('Now', 'Now'), ('Today', 'Today'), ('This Week', 'This Week'), ('This Month', 'This Month'), ('3 Months', '3 Months'), ('This Year', 'This Year'), ('Future', 'Future')], default='', max_length=20),
+        ),
+    ]
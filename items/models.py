@@ -1,4 +1,7 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Concat, Substr
 from django.utils import timezone
 
 
@@ -34,6 +37,21 @@ class Item(models.Model):
         ('1 hour', '1 hour'),
         ('3 hours', '3 hours'),
     ]
+
+    # Minutes per action length, used for subtree time rollups
+    ACTION_LENGTH_MINUTES = {
+        '5 minutes': 5,
+        '15 minutes': 15,
+        '1 hour': 60,
+        '3 hours': 180,
+    }
+
+    # Types that can contain other items (Journey -> Project -> Action)
+    PARENT_TYPES = ['Journey', 'Project']
+
+    # Statuses left out of subtree rollups: shelved or dropped work is
+    # neither pending nor done, so it should not hold back the percentage
+    ROLLUP_EXCLUDED_STATUSES = ['Archive', 'Remove']
     
     # Time frame choices
     TIME_FRAME_CHOICES = [
@@ -80,9 +98,23 @@ class Item(models.Model):
         blank=True,
         related_name='items'
     )
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='children'
+    )
+    # Materialized path of ancestor ids, root first: "3/17/" for a child of 17 under 3
+    path = models.CharField(max_length=255, blank=True, default='', editable=False, db_index=True)
     date_created = models.DateTimeField(auto_now_add=True)
     date_completed = models.DateTimeField(null=True, blank=True)
 
+    # Cached rollups over all descendants (ROLLUP_EXCLUDED_STATUSES left out)
+    rollup_total = models.IntegerField(default=0, editable=False)
+    rollup_complete = models.IntegerField(default=0, editable=False)
+    rollup_minutes = models.IntegerField(default=0, editable=False)
+
     class Meta:
         ordering = ['-date_created']
 
@@ -101,6 +133,87 @@ class Item(models.Model):
             return self.value + (6 - self.difficulty)
         return None
 
+    @property
+    def subtree_path(self):
+        """Path prefix shared by every descendant of this item."""
+        return f'{self.path}{self.pk}/'
+
+    @property
+    def ancestor_ids(self):
+        """Ids of all ancestors, root first."""
+        return [int(pk) for pk in self.path.split('/') if pk]
+
+    @property
+    def rollup_percent(self):
+        """
+        Completion percentage of the subtree.
+        Returns None if the item has no descendants.
+        """
+        if self.rollup_total:
+            return round(100 * self.rollup_complete / self.rollup_total)
+        return None
+
+    @staticmethod
+    def subtree_q(prefix):
+        """
+        Match paths starting with prefix.
+        Uses a range instead of LIKE so the path index is used on SQLite;
+        '0' is the character right after the '/' separator.
+        """
+        return Q(path__gte=prefix, path__lt=prefix[:-1] + '0')
+
+    def descendants(self):
+        """All items below this one, as a single indexed query."""
+        return Item.objects.filter(Item.subtree_q(self.subtree_path))
+
+    def ancestors(self):
+        """All items above this one."""
+        return Item.objects.filter(id__in=self.ancestor_ids)
+
+    def clean(self):
+        """Keep the Journey -> Project -> Action hierarchy well formed."""
+        super().clean()
+        stored_parent_id = None
+        if self.pk is not None:
+            stored_parent_id = Item.objects.filter(pk=self.pk).values_list('parent_id', flat=True).first()
+
+        # Rule: a new parent must be an open-ended container outside this subtree
+        if self.parent_id is not None and self.parent_id != stored_parent_id:
+            parent = Item.objects.only('path', 'type', 'status').get(pk=self.parent_id)
+            if parent.type not in Item.PARENT_TYPES:
+                raise ValidationError({'parent': 'Only a Journey or Project can contain other items.'})
+            if parent.status == 'Remove':
+                raise ValidationError({'parent': 'Cannot nest under a removed item.'})
+            if self.pk is not None and (self.parent_id == self.pk or self.pk in parent.ancestor_ids):
+                raise ValidationError({'parent': 'An item cannot be nested under itself or its descendants.'})
+
+        # Rule: an item with children must stay a Journey or Project
+        if self.pk is not None and self.type not in Item.PARENT_TYPES and self.children.exists():
+            raise ValidationError({'type': 'Move this item\'s children elsewhere before changing its type.'})
+
+    @classmethod
+    def refresh_rollups(cls, ids):
+        """Recompute cached rollups for the given items from their subtrees."""
+        minutes = Case(
+            *[When(type='Action', action_length=length, then=Value(mins))
+              for length, mins in cls.ACTION_LENGTH_MINUTES.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        for node in cls.objects.filter(id__in=ids).only('id', 'path'):
+            totals = cls.objects.filter(
+                cls.subtree_q(node.subtree_path)
+            ).exclude(status__in=cls.ROLLUP_EXCLUDED_STATUSES).aggregate(
+                total=Count('id'),
+                complete=Count('id', filter=Q(status='Complete')),
+                minutes=Sum(minutes),
+            )
+            cls.objects.filter(id=node.id).update(
+                rollup_total=totals['total'],
+                rollup_complete=totals['complete'],
+                rollup_minutes=totals['minutes'] or 0,
+            )
+
     def save(self, *args, **kwargs):
         """Apply business rules before saving."""
         # Rule: If type != Action, clear action_length
@@ -114,6 +227,64 @@ class Item(models.Model):
         else:
             # Rule: If status is not Complete, clear date_completed
             self.date_completed = None
-        
-        super().save(*args, **kwargs)
 
+        with transaction.atomic():
+            old = None
+            if self.pk is not None:
+                old = Item.objects.select_for_update().filter(pk=self.pk).values(
+                    'parent_id', 'path', 'type', 'action_length', 'status',
+                    'rollup_total', 'rollup_complete', 'rollup_minutes',
+                ).first()
+
+            # Rule: rollups are owned by refresh_rollups(); keep the DB copy
+            # so a stale instance cannot overwrite them
+            if old is not None:
+                self.rollup_total = old['rollup_total']
+                self.rollup_complete = old['rollup_complete']
+                self.rollup_minutes = old['rollup_minutes']
+
+            # Rule: path mirrors the parent chain, read from the DB since
+            # subtree moves and rollups are written with .update()
+            if old is not None and old['parent_id'] == self.parent_id:
+                self.path = old['path']
+            elif self.parent_id:
+                parent_path = Item.objects.values_list('path', flat=True).get(pk=self.parent_id)
+                self.path = f'{parent_path}{self.parent_id}/'
+            else:
+                self.path = ''
+
+            super().save(*args, **kwargs)
+
+            if old is None:
+                if self.parent_id:
+                    Item.refresh_rollups(self.ancestor_ids)
+                return
+
+            # Rule: moving an item moves its whole subtree
+            if old['path'] != self.path:
+                old_prefix = f"{old['path']}{self.pk}/"
+                Item.objects.filter(Item.subtree_q(old_prefix)).update(
+                    path=Concat(Value(self.subtree_path), Substr('path', len(old_prefix) + 1))
+                )
+
+            # Rule: ancestors' rollups follow changes to this subtree
+            rollup_fields = ('parent_id', 'type', 'action_length', 'status')
+            if any(old[f] != getattr(self, f) for f in rollup_fields):
+                old_ancestors = [int(pk) for pk in old['path'].split('/') if pk]
+                Item.refresh_rollups(set(old_ancestors) | set(self.ancestor_ids))
+
+    def delete(self, *args, **kwargs):
+        """Promote children to the deleted item's parent level."""
+        with transaction.atomic():
+            self.parent_id, self.path = Item.objects.select_for_update().values_list(
+                'parent_id', 'path'
+            ).get(pk=self.pk)
+            prefix = self.subtree_path
+            ancestor_ids = self.ancestor_ids
+            Item.objects.filter(Item.subtree_q(prefix)).update(
+                path=Concat(Value(self.path), Substr('path', len(prefix) + 1))
+            )
+            Item.objects.filter(parent_id=self.pk).update(parent=self.parent_id)
+            result = super().delete(*args, **kwargs)
+            Item.refresh_rollups(ancestor_ids)
+        return result
@@ -243,6 +243,26 @@
         });
     }
 
+    /**
+     * Fill parent selects from the shared option list, skipping the
+     * item itself and its descendants (their paths start with its subtree path)
+     */
+    function initParentSelects() {
+        const template = document.getElementById('parent-options');
+        if (!template) return;
+
+        const options = Array.from(template.content.querySelectorAll('option'));
+        document.querySelectorAll('.parent-select').forEach(select => {
+            const subtree = select.dataset.subtree;
+            const current = select.value;
+            options.forEach(option => {
+                if (option.value === current) return;
+                if (option.dataset.subtree.startsWith(subtree)) return;
+                select.appendChild(option.cloneNode(true));
+            });
+        });
+    }
+
     /**
      * Initialize sorting
      */
@@ -272,6 +292,7 @@
 
     // Initialize on DOM ready
     document.addEventListener('DOMContentLoaded', function() {
+        initParentSelects();
         initInlineEditing();
         initSorting();
     });
@@ -0,0 +1,147 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from .models import Item
+
+
+class HierarchyTestCase(TestCase):
+    """Base fixture: Journey -> Project -> two Actions."""
+
+    def setUp(self):
+        self.journey = Item.objects.create(note='Journey', type='Journey')
+        self.project = Item.objects.create(note='Project', type='Project', parent=self.journey)
+        self.action_a = Item.objects.create(
+            note='Action A', type='Action', action_length='1 hour', parent=self.project
+        )
+        self.action_b = Item.objects.create(
+            note='Action B', type='Action', action_length='5 minutes', parent=self.project
+        )
+
+    def reload(self, *items):
+        for item in items:
+            item.refresh_from_db()
+
+    def update(self, item, field, value):
+        url = f'/{settings.URL_SECRET_PREFIX}/api/item/{item.id}/update/'
+        return self.client.post(url, json.dumps({'field': field, 'value': value}), content_type='application/json')
+
+
+class PathTests(HierarchyTestCase):
+
+    def test_create_under_parent(self):
+        self.reload(self.journey, self.project)
+        self.assertEqual(self.project.path, f'{self.journey.id}/')
+        self.assertEqual(self.action_a.path, f'{self.journey.id}/{self.project.id}/')
+        self.assertEqual(
+            set(self.journey.descendants().values_list('id', flat=True)),
+            {self.project.id, self.action_a.id, self.action_b.id},
+        )
+        self.assertEqual((self.journey.rollup_total, self.journey.rollup_minutes), (3, 65))
+        self.assertEqual((self.project.rollup_total, self.project.rollup_minutes), (2, 65))
+
+    def test_move_subtree(self):
+        other = Item.objects.create(note='Other', type='Journey')
+        self.project.parent = other
+        self.project.save()
+
+        self.reload(self.journey, other, self.action_a, self.action_b)
+        expected = f'{other.id}/{self.project.id}/'
+        self.assertEqual(self.action_a.path, expected)
+        self.assertEqual(self.action_b.path, expected)
+        self.assertEqual((self.journey.rollup_total, self.journey.rollup_minutes), (0, 0))
+        self.assertEqual((other.rollup_total, other.rollup_minutes), (3, 65))
+
+    def test_save_with_stale_parent_keeps_path(self):
+        stale = Item.objects.select_related('parent').get(pk=self.action_a.pk)
+        other = Item.objects.create(note='Other', type='Journey')
+        project = Item.objects.get(pk=self.project.pk)
+        project.parent = other
+        project.save()
+
+        stale.status = 'Complete'
+        stale.save()
+
+        self.reload(self.journey, other, stale)
+        self.assertEqual(stale.path, f'{other.id}/{self.project.id}/')
+        self.assertEqual(list(self.journey.descendants()), [])
+        self.assertEqual(
+            (other.rollup_total, other.rollup_complete, other.rollup_minutes), (3, 1, 65)
+        )
+
+    def test_delete_middle_node(self):
+        self.project.delete()
+
+        self.reload(self.journey, self.action_a)
+        self.assertEqual(self.action_a.parent_id, self.journey.id)
+        self.assertEqual(self.action_a.path, f'{self.journey.id}/')
+        self.assertEqual((self.journey.rollup_total, self.journey.rollup_minutes), (2, 65))
+
+    def test_subtree_q_does_not_match_shared_prefix(self):
+        Item.objects.filter(pk=self.action_a.pk).update(path='17/')
+        Item.objects.filter(pk=self.action_b.pk).update(path='170/')
+        matches = Item.objects.filter(Item.subtree_q('17/')).values_list('id', flat=True)
+        self.assertEqual(list(matches), [self.action_a.id])
+
+
+class RollupTests(HierarchyTestCase):
+
+    def test_status_change_through_update_item(self):
+        response = self.update(self.action_a, 'status', 'Complete')
+        self.assertEqual(response.status_code, 200)
+
+        self.reload(self.journey, self.project)
+        self.assertEqual((self.project.rollup_complete, self.project.rollup_percent), (1, 50))
+        self.assertEqual((self.journey.rollup_complete, self.journey.rollup_percent), (1, 33))
+
+    def test_save_stale_ancestor_keeps_rollups(self):
+        journey = Item.objects.create(note='Journey 2', type='Journey')
+        Item.objects.create(note='Action', type='Action', action_length='1 hour', parent=journey)
+
+        journey.note = 'Renamed'
+        journey.save()
+
+        self.reload(journey)
+        self.assertEqual((journey.rollup_total, journey.rollup_minutes), (1, 60))
+
+    def test_archived_items_are_left_out(self):
+        self.action_a.status = 'Complete'
+        self.action_a.save()
+        self.action_b.status = 'Archive'
+        self.action_b.save()
+
+        self.reload(self.project)
+        self.assertEqual((self.project.rollup_total, self.project.rollup_percent), (1, 100))
+        self.assertEqual(self.project.rollup_minutes, 60)
+
+
+class ValidationTests(HierarchyTestCase):
+
+    def test_cycle_rejected(self):
+        response = self.update(self.journey, 'parent', self.project.id)
+        self.assertEqual(response.status_code, 400)
+        self.reload(self.journey)
+        self.assertIsNone(self.journey.parent_id)
+
+    def test_action_parent_rejected(self):
+        response = self.update(self.action_b, 'parent', self.action_a.id)
+        self.assertEqual(response.status_code, 400)
+
+    def test_removed_parent_rejected(self):
+        removed = Item.objects.create(note='Gone', type='Project', status='Remove')
+        self.action_a.parent = removed
+        with self.assertRaises(ValidationError):
+            self.action_a.clean()
+
+    def test_container_with_children_keeps_type(self):
+        response = self.update(self.project, 'type', 'Action')
+        self.assertEqual(response.status_code, 400)
+        self.reload(self.project)
+        self.assertEqual(self.project.type, 'Project')
+
+    def test_malformed_parent_values_rejected(self):
+        for value in ([1], {'id': 1}, 1.5, True, '1.5', '9' * 30):
+            response = self.update(self.action_a, 'parent', value)
+            self.assertEqual(response.status_code, 400, value)
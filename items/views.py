@@ -1,5 +1,6 @@
 import json
 import random
+from django.core.exceptions import ValidationError
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
@@ -44,7 +45,7 @@ def organize(request):
     sort_by = request.GET.get('sort', '-date_created')
     
     # Build queryset
-    items = Item.objects.all()
+    items = Item.objects.select_related('parent')
     
     # Apply status filter
     if status_filters:
@@ -125,9 +126,15 @@ def organize(request):
     # Get all categories for filter dropdown
     categories = LifeCategory.objects.all()
     
+    # Journeys and Projects that items can be nested under
+    parents = Item.objects.filter(
+        type__in=Item.PARENT_TYPES
+    ).exclude(status='Remove').only('id', 'note', 'path').order_by('note')
+    
     context = {
         'items': items,
         'categories': categories,
+        'parents': parents,
         'current_statuses': status_filters,
         'current_time_frames': time_frame_filters,
         'current_types': type_filters,
@@ -162,7 +169,7 @@ def update_item(request, item_id):
         return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
     
     # Allowed editable fields
-    allowed_fields = ['note', 'type', 'action_length', 'time_frame', 'value', 'difficulty', 'status', 'life_category']
+    allowed_fields = ['note', 'type', 'action_length', 'time_frame', 'value', 'difficulty', 'status', 'life_category', 'parent']
     
     if field not in allowed_fields:
         return JsonResponse({'success': False, 'error': f'Field not allowed: {field}'}, status=400)
@@ -183,6 +190,17 @@ def update_item(request, item_id):
                 item.life_category = category
             except (LifeCategory.DoesNotExist, ValueError):
                 return JsonResponse({'success': False, 'error': 'Invalid category'}, status=400)
+    elif field == 'parent':
+        if value == '' or value is None:
+            item.parent = None
+        else:
+            try:
+                # Only an int or a digit string is a valid id (no floats, lists or bools)
+                if isinstance(value, bool) or not isinstance(value, (int, str)) or not str(value).isdigit():
+                    raise ValueError(value)
+                item.parent = Item.objects.get(id=int(value))
+            except (Item.DoesNotExist, TypeError, ValueError, OverflowError):
+                return JsonResponse({'success': False, 'error': 'Invalid parent'}, status=400)
     elif field in ['value', 'difficulty']:
         # Handle integer fields
         if value == '' or value is None:
@@ -200,7 +218,15 @@ def update_item(request, item_id):
         # String fields
         setattr(item, field, value if value else '')
     
-    # Save applies business rules (clear action_length if not Action, handle date_completed)
+    # Validate hierarchy rules (parent must be a Journey/Project, no cycles,
+    # items with children keep a container type)
+    try:
+        item.clean()
+    except ValidationError as e:
+        return JsonResponse({'success': False, 'error': e.messages[0]}, status=400)
+    
+    # Save applies business rules (clear action_length if not Action, handle date_completed,
+    # keep the subtree path and ancestor rollups in sync)
     item.save()
     
     # Return updated item data
@@ -217,6 +243,7 @@ def update_item(request, item_id):
             'status': item.status,
             'life_category_id': item.life_category_id,
             'life_category_name': item.life_category.name if item.life_category else '',
+            'parent_id': item.parent_id,
             'score': item.score,
             'date_completed': item.date_completed.isoformat() if item.date_completed else None,
         }